@@ -3,6 +3,13 @@ from flask import Flask, request, jsonify, send_from_directory
 from pathlib import Path
 import sys
 
+# Optional: orjson serializes large sanitized batches several times faster
+# than the stdlib json used by jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Make ../code importable
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT / "code"))
@@ -45,13 +52,20 @@ def index():
 @app.post("/api/sanitize")
 def api_sanitize():
     try:
-        payload = request.get_json(force=True, silent=False) or {}
+        if orjson is not None:
+            payload = orjson.loads(request.get_data()) or {}
+        else:
+            payload = request.get_json(force=True, silent=False) or {}
         input_data = payload.get("input_data", [])
         query_params = payload.get("query_params", {})
         # Always return audit to power the UI
         query_params["return_audit"] = True
 
         result = bot.bot_detect_and_sanitize(input_data=input_data, query_params=query_params)
+        if orjson is not None:
+            return app.response_class(
+                orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json"
+            )
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -4,10 +4,40 @@ import hmac
 import hashlib
 import base64
 import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 
 import pandas as pd
 
+# Optional: google-re2 gives linear-time matching (no catastrophic backtracking),
+# which matters because patterns run on user-supplied text behind a web endpoint.
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+# Optional: Hyperscan scans all patterns in one SIMD-accelerated pass; used
+# when its bindings are installed and accept our pattern set.
+try:
+    import hyperscan as _hs
+except ImportError:
+    _hs = None
+
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile with RE2 when it is installed and accepts the pattern, else stdlib re.
+
+    RE2 rejects lookaround (used by the card/ssn/phone boundaries), so those
+    patterns keep the backtracking engine; everything else gets the DFA.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern, flags)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
 
 # for address matching
 # Common street suffixes we try to recognize
@@ -20,27 +50,124 @@ ADDRESS_HOUSENUM = r"\d{1,6}[A-Za-z]?(?:[/-]\d{1,4})?"
 # Street name: allow letters, numbers, spaces, dots, hyphens, apostrophes
 ADDRESS_STREET = r"[A-Za-z0-9.\-'\s]+?"
 
+# Compiled once; _mask runs these per matched value
+_ADDRESS_MASK_RE = _compile(
+    rf"^(?P<num>{ADDRESS_HOUSENUM})\s+(?P<street>{ADDRESS_STREET})\s(?P<suf>{ADDRESS_SUFFIX})\b(?P<trail>.*)$",
+    re.ASCII,
+)
+_PHONE_CC_RE = _compile(r"^\+?\d{1,3}", re.ASCII)
+
+# Every PII type needs a digit, an @, or a capital letter somewhere; cells
+# without any of those (empty strings, "n/a", lowercase prose) can skip the scan
+_NEED_SCAN = _compile(r"[\d@A-Z]", re.ASCII)
+
+# Deletion table for stripping everything but 0-9 in one C-level pass
+# (the matched text is ASCII, so covering Latin-1 is enough)
+_KEEP_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if chr(c) not in "0123456789"))
+
 
 def _b32_short(h: bytes, n: int = 12) -> str:
     """Make a short, URL-safe base32 string from bytes (used to build tokens)."""
     return base64.b32encode(h).decode("ascii").rstrip("=").lower()[:n]
 
 
+# Maps an ASCII digit byte straight to its doubled-then-digit-summed Luhn value
+_LUHN_DOUBLE = bytes.maketrans(b"0123456789", bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+
+
 def luhn_valid(num: str) -> bool:
     """Return True if the number passes the Luhn check (credit/debit cards)."""
-    s = 0
-    alt = False
-    for d in reversed(num):
-        if not d.isdigit():
-            return False
-        n = ord(d) - 48
-        if alt:
-            n *= 2
-            if n > 9:
-                n -= 9
-        s += n
-        alt = not alt
-    return s % 10 == 0
+    if not num or not (num.isascii() and num.isdigit()):
+        return False
+    b = num.encode("ascii")
+    # Digits in odd positions (from the right) count as-is; even positions are
+    # doubled via the lookup table. Both sums run at C speed over byte slices.
+    odd = b[-1::-2]
+    even = b[-2::-2].translate(_LUHN_DOUBLE)
+    return (sum(odd) - 48 * len(odd) + sum(even)) % 10 == 0
+
+
+def _trim_masked_address(raw: str, repl: str) -> Tuple[str, int]:
+    """Trim the verbatim trail from a masked address replacement.
+
+    _mask rewrites only "<housenum> <street> <suffix>" and re-emits the rest
+    of the match untouched, so the scan must not consume that trail — any PII
+    inside it (an SSN or phone after the street) would otherwise be skipped.
+    Returns the replacement without the trail and the number of characters of
+    the raw match actually covered.
+    """
+    m = _ADDRESS_MASK_RE.match(raw)
+    if m is not None:
+        trail = m.group("trail")
+        if trail and repl.endswith(trail):
+            return repl[: -len(trail)], m.start("trail")
+    return repl, len(raw)
+
+
+def _card_normalize_valid(raw: str) -> Tuple[str, bool]:
+    """Strip a card candidate to digits and Luhn-check it."""
+    digits = raw.translate(_KEEP_DIGITS)
+    return digits, (13 <= len(digits) <= 19 and luhn_valid(digits))
+
+
+class _AuditBuffer:
+    """Audit events as parallel lists (struct-of-arrays).
+
+    Appending to flat lists avoids allocating a dict per match in the hot
+    rewrite loop; the per-row dicts are built once, at return time.
+    """
+
+    __slots__ = ("row", "column", "type", "original", "action", "replacement")
+
+    def __init__(self):
+        self.row: List[int] = []
+        self.column: List[str] = []
+        self.type: List[str] = []
+        self.original: List[str] = []
+        self.action: List[str] = []
+        self.replacement: List[str] = []
+
+    def append(self, row: int, column: str, ptype: str, raw: str, action: str, replacement: str) -> None:
+        """Record one match; previews are truncated here so no raw PII is kept."""
+        self.row.append(row)
+        self.column.append(column)
+        self.type.append(ptype)
+        self.original.append(raw[:8] + ("…" if len(raw) > 8 else ""))
+        self.action.append(action)
+        self.replacement.append(replacement[:12] + ("…" if len(replacement) > 12 else ""))
+
+    def to_rows(self, n_rows: int) -> List[List[Dict[str, Any]]]:
+        """Expand the parallel lists into the per-row list-of-dicts shape."""
+        rows: List[List[Dict[str, Any]]] = [[] for _ in range(n_rows)]
+        for row, column, ptype, original, action, replacement in zip(
+            self.row, self.column, self.type, self.original, self.action, self.replacement
+        ):
+            rows[row].append(
+                {
+                    "column": column,
+                    "type": ptype,
+                    "original_preview": original,
+                    "action": action,
+                    "replacement_preview": replacement,
+                }
+            )
+        return rows
+
+
+# One bot per worker process, built once by _init_worker (see sanitize_parallel)
+_WORKER_BOT = None
+
+
+def _init_worker(config: Dict[str, Any], hmac_secret: str) -> None:
+    """Construct the per-process bot; same HMAC key, so tokens match across shards."""
+    global _WORKER_BOT
+    _WORKER_BOT = SanitizeBot(config=config, hmac_secret=hmac_secret)
+
+
+def _sanitize_chunk(chunk: List[Dict[str, Any]], method_override: Optional[str]):
+    """Sanitize one shard of rows inside a worker process."""
+    sanitized, audit = _WORKER_BOT._sanitize(pd.DataFrame(chunk), method_override)
+    return sanitized.to_dict(orient="records"), audit
 
 
 class SanitizeBot:
@@ -52,18 +179,23 @@ class SanitizeBot:
     - Optional audit trail
     """
 
-    # Only the six requested types (regex finds candidates; validators confirm)
-    PATTERNS: Dict[str, re.Pattern] = {
-        "credit_card": re.compile(r"(?<!\d)(?:\d[ -]?){13,19}(?!\d)"),
-        "ssn": re.compile(r"\b(?!000|666|9\d{2})\d{3}[- ]?(?!00)\d{2}[- ]?(?!0000)\d{4}\b"),
-        "email": re.compile(r"\b[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[A-Za-z]{2,}\b"),
-        "phone": re.compile(
-            r"(?<!\d)(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{2,4}\)?[-.\s]?)\d{3,4}[-.\s]?\d{4}(?!\d)"
+    # Only the six requested types (regex finds candidates; validators confirm).
+    # All patterns target ASCII text, and ASCII \d/\s/\b classes test faster
+    # than their Unicode-aware defaults.
+    PATTERNS: Dict[str, Any] = {
+        "credit_card": _compile(r"(?<!\d)(?:\d[ -]?){13,19}(?!\d)", re.ASCII),
+        "ssn": _compile(r"\b(?!000|666|9\d{2})\d{3}[- ]?(?!00)\d{2}[- ]?(?!0000)\d{4}\b", re.ASCII),
+        "email": _compile(r"\b[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[A-Za-z]{2,}\b", re.ASCII),
+        "phone": _compile(
+            r"(?<!\d)(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{2,4}\)?[-.\s]?)\d{3,4}[-.\s]?\d{4}(?!\d)",
+            re.ASCII,
         ),
-        "address": re.compile(
-            rf"\b{ADDRESS_HOUSENUM}\s+{ADDRESS_STREET}\s{ADDRESS_SUFFIX}\b(?:[ ,A-Za-z0-9.\-#]*)?"
+        "address": _compile(
+            rf"\b{ADDRESS_HOUSENUM}\s+{ADDRESS_STREET}\s{ADDRESS_SUFFIX}\b(?:[ ,A-Za-z0-9.\-#]*)?",
+            re.ASCII,
         ),
-        "name": re.compile(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3})\b"),
+        # no capturing group: the pattern must stay clean inside the combined alternation
+        "name": _compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3}\b", re.ASCII),
     }
 
     TOKEN_PREFIXES = {
@@ -81,6 +213,8 @@ class SanitizeBot:
         self.config: Dict[str, Any] = kwargs.get("config", {}) or {}
         key = kwargs.get("hmac_secret") or os.environ.get("PII_HMAC_KEY") or "dev-only-ephemeral-key"
         self._hmac_key: bytes = key.encode("utf-8")
+        # Keyed once; _tokenize copies this to skip the HMAC key schedule per call
+        self._hmac_proto = hmac.new(self._hmac_key, digestmod=hashlib.sha256)
 
         # Policy settings: defaults, per-type, column hints, and allow/deny lists
         self.policy = {
@@ -101,10 +235,57 @@ class SanitizeBot:
             "allowlist": set(self.config.get("allowlist", [])),
             "denylist": set(self.config.get("denylist", [])),
         }
+        # Hinted types whose columns are scanned with just their own pattern
+        # (an "email" column is assumed not to also hold cards/addresses).
+        # Set strict_hinted_columns to False to keep the full scan on hinted
+        # columns. Hints that name no known pattern are ignored here, matching
+        # how unknown hints are tolerated during the scan.
+        self.policy["strict_hinted"] = (
+            {v for v in self.policy["column_hints"].values() if v in self.PATTERNS}
+            if bool(self.config.get("strict_hinted_columns", True))
+            else set()
+        )
 
         # To avoid false positives, names from free text are OFF by default
         self.detect_names_in_free_text: bool = bool(self.config.get("detect_names_in_free_text", False))
-        self._token_cache: Dict[str, str] = {}
+
+        # Per-type action resolved once; _action_for runs per match
+        self._action_by_type: Dict[str, str] = {
+            pt: self.policy["per_type"].get(pt, {}).get("action") or self.policy["defaults"]["action"]
+            for pt in self.PATTERNS
+        }
+
+        # Token cache is a capped LRU so high-cardinality inputs on a
+        # long-running server can't grow memory without bound; tuple keys
+        # avoid an f-string allocation per probe
+        self._token_cache_max: int = int(self.config.get("max_token_cache_size", 100_000))
+        self._token_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+        # Private PRNG for _scramble, reseeded per value from the HMAC so
+        # shuffles are deterministic (and cacheable) for a given secret
+        self._rng = random.Random()
+
+        # One alternation over all types so each cell is scanned once instead of
+        # once per type; lastgroup tells the callback which type matched.
+        self._combined = _compile(
+            "|".join(f"(?P<{name}>(?:{p.pattern}))" for name, p in self.PATTERNS.items()),
+            re.ASCII,
+        )
+
+        # Pattern names in alternation order, shared by the rejected-match
+        # retry in _rewrite_all and the Hyperscan id mapping
+        self._type_order: List[str] = list(self.PATTERNS.keys())
+
+        # Multi-pattern Hyperscan database (None when unavailable; the
+        # combined re scan is the fallback)
+        self._hs_db = self._build_hs_db()
+
+        # One regex covering all "already sanitized" shapes: a token prefix at
+        # the start, a mask run, or a redaction/mask marker
+        self._sanitized_re = _compile(
+            r"^(?:" + "|".join(re.escape(p) for p in self.TOKEN_PREFIXES.values()) + r")"
+            r"|\*{3,}|\[REDACTED\]|\[MASKED\]"
+        )
 
     # ---------------- Public API ----------------
 
@@ -126,108 +307,393 @@ class SanitizeBot:
         method_override = qp.get("method")
         return_audit = bool(qp.get("return_audit", False))
 
-        df = pd.DataFrame(kwargs["input_data"])  # turn rows into a DataFrame
-        sanitized_df, audit_rows = self._sanitize(df, method_override)
+        input_data = kwargs["input_data"]
+        n = len(input_data)
+
+        if n > self.CHUNK_ROWS:
+            # Process big batches chunk by chunk so only one chunk's DataFrame
+            # (plus its sanitized copy) is alive at a time. Every chunk gets
+            # the column union of the whole batch (in first-seen order, like
+            # pd.DataFrame on the full list) so record shape doesn't depend on
+            # where the chunk boundaries fall.
+            columns: Dict[str, None] = {}
+            for row in input_data:
+                for key in row:
+                    columns.setdefault(key, None)
+            batch_columns = list(columns)
+            records: List[Dict[str, Any]] = []
+            audit_rows: List[List[Dict[str, Any]]] = []
+            for i in range(0, n, self.CHUNK_ROWS):
+                chunk_df = pd.DataFrame(input_data[i:i + self.CHUNK_ROWS], columns=batch_columns)
+                sanitized_df, chunk_audit = self._sanitize(chunk_df, method_override, return_audit=return_audit)
+                records.extend(sanitized_df.to_dict(orient="records"))
+                audit_rows.extend(chunk_audit)
+        else:
+            df = pd.DataFrame(input_data)  # turn rows into a DataFrame
+            sanitized_df, audit_rows = self._sanitize(df, method_override, return_audit=return_audit)
+            records = sanitized_df.to_dict(orient="records")
 
         if return_audit:
-            return {"data": sanitized_df.to_dict(orient="records"), "audit": audit_rows}
-        return sanitized_df.to_dict(orient="records")
+            return {"data": records, "audit": audit_rows}
+        return records
 
-    # ---------------- Core sanitize ----------------
+    # Below this many rows, process startup costs more than it saves
+    PARALLEL_MIN_ROWS = 5000
 
-    def _sanitize(self, df: pd.DataFrame, method_override: Optional[str]):
-        """Walk each cell, apply hinted type first, then generic scan; collect audit per row."""
-        audit_rows: List[List[Dict[str, Any]]] = []
-        out_df = df.copy(deep=True)
-
-        for idx, row in out_df.iterrows():
-            row_audit: List[Dict[str, Any]] = []
-            for col in out_df.columns:
-                original = row[col]
-                text = "" if pd.isna(original) else str(original)
+    # Rows per DataFrame when bot_detect_and_sanitize streams a large batch
+    CHUNK_ROWS = 1000
 
-                # 1) Apply column-hinted type first (e.g., "email" column)
-                hinted_type = self.policy["column_hints"].get(col)
-                if hinted_type in self.PATTERNS:
-                    text, col_audit = self._rewrite_with_type(text, hinted_type, method_override, col)
-                    row_audit.extend(col_audit)
+    def sanitize_parallel(self, rows: List[Dict[str, Any]], method_override: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Sanitize a large list of row dicts across CPU cores.
 
-                # 2) Generic scan (names in free text are optional/off by default)
-                for ptype in ["credit_card", "ssn", "email", "phone", "address", "name"]:
-                    if ptype == hinted_type:
-                        continue
-                    if ptype == "name" and not self.detect_names_in_free_text:
-                        continue
-                    text, col_audit = self._rewrite_with_type(text, ptype, method_override, col)
-                    row_audit.extend(col_audit)
+        Rows are sharded over a process pool; each worker builds an identical
+        bot (same config and HMAC key), so tokens are stable across shards and
+        the result matches the serial path. Small inputs fall back to the
+        serial path. Returns (records, audit_rows).
+        """
+        n = len(rows)
+        if n <= self.PARALLEL_MIN_ROWS:
+            sanitized, audit = self._sanitize(pd.DataFrame(rows), method_override)
+            return sanitized.to_dict(orient="records"), audit
+
+        workers = workers or os.cpu_count() or 1
+        chunk_size = -(-n // workers)  # ceil division
+        chunks = [rows[i:i + chunk_size] for i in range(0, n, chunk_size)]
+
+        records: List[Dict[str, Any]] = []
+        audits: List[List[Dict[str, Any]]] = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config, self._hmac_key.decode("utf-8")),
+        ) as pool:
+            for recs, audit in pool.map(_sanitize_chunk, chunks, [method_override] * len(chunks)):
+                records.extend(recs)
+                audits.extend(audit)
+        return records, audits
 
-                out_df.at[idx, col] = text  # write back sanitized text
-            audit_rows.append(row_audit)
+    # ---------------- Core sanitize ----------------
 
-        return out_df, audit_rows
+    def _sanitize(self, df: pd.DataFrame, method_override: Optional[str], return_audit: bool = True):
+        """Walk each column once, apply hinted type first, then generic scan; collect audit per row."""
+        audit = _AuditBuffer() if return_audit else None
+        new_cols: Dict[str, Any] = {}
+
+        for col in df.columns:
+            hinted_type = self.policy["column_hints"].get(col)
+            if hinted_type is not None and hinted_type not in self.PATTERNS:
+                hinted_type = None  # unknown hint (e.g. a typo): treat as unhinted
+            strict = hinted_type in self.policy["strict_hinted"]
+            # Per-column decision memo for the strict fast path (repeated
+            # values are common in typed columns)
+            memo: Dict[str, Tuple[str, Optional[str]]] = {}
+            values = df[col].tolist()
+            new_values: List[str] = []
+            any_changed = False
+
+            for i, original in enumerate(values):
+                text = "" if pd.isna(original) else str(original)
 
-    # ---------------- Rewriting helpers ----------------
+                # Short-circuit clearly benign cells; hinted columns always
+                # get their type-specific scan
+                if hinted_type is not None or _NEED_SCAN.search(text):
+                    if strict:
+                        # Strict hinted column: only the hinted type's pattern runs
+                        text = self._rewrite_hinted(text, hinted_type, method_override, col, i, audit, memo)
+                    else:
+                        # Single pass: the combined pattern finds all types at once;
+                        # the column hint only matters for gating name detection.
+                        text = self._rewrite_all(text, method_override, col, hinted_type, i, audit)
 
-    def _rewrite_with_type(
-        self, text: str, ptype: str, method_override: Optional[str], column: str
-    ) -> Tuple[str, List[Dict[str, Any]]]:
-        """Find matches of a specific PII type, transform them, and log compact audit info."""
-        pattern = self.PATTERNS.get(ptype)
-        if not pattern:
-            return text, []
+                if not any_changed and text != original:
+                    any_changed = True
+                new_values.append(text)
 
-        audit_spans: List[Dict[str, Any]] = []
+            # Untouched columns keep the original Series (no copy); only
+            # columns with at least one rewritten cell get materialized
+            new_cols[col] = pd.Series(new_values, index=df.index) if any_changed else df[col]
 
-        def _replacement(m: re.Match) -> str:
-            """Decide action for the match, validate it, replace it, and record an audit event."""
-            raw = m.group(0)
+        audit_rows = audit.to_rows(len(df)) if audit is not None else [[] for _ in range(len(df))]
+        return pd.DataFrame(new_cols, index=df.index), audit_rows
 
-            # Skip if already sanitized or explicitly allowlisted
-            if self._looks_sanitized(raw, ptype):
-                return raw
-            if raw in self.policy["allowlist"]:
-                return raw
-
-            # Decide action (denylist forces redact)
-            act = "redact" if raw in self.policy["denylist"] else self._action_for(ptype, method_override)
-
-            # Normalize + validate (e.g., Luhn for cards, 9 digits for SSN, etc.)
-            normalized, valid = self._normalize_and_validate(ptype, raw, column)
-            if not valid:
-                return raw  # treat as non-PII if validation fails
-
-            # Apply action
-            if act == "tokenize":
-                repl = self._tokenize(ptype, normalized)
-            elif act == "mask":
-                repl = self._mask(ptype, raw, normalized)
-            elif act == "scramble":
-                repl = self._scramble(raw)
-            elif act == "redact":
-                repl = "[REDACTED]"
-            else:
-                repl = raw
+    # ---------------- Rewriting helpers ----------------
 
-            # Save a short audit preview (no raw PII)
-            audit_spans.append(
-                {
-                    "column": column,
-                    "type": ptype,
-                    "original_preview": raw[:8] + ("…" if len(raw) > 8 else ""),
-                    "action": act,
-                    "replacement_preview": repl[:12] + ("…" if len(repl) > 12 else ""),
-                }
+    def _rewrite_all(
+        self,
+        text: str,
+        method_override: Optional[str],
+        column: str,
+        hinted_type: Optional[str],
+        row: int,
+        audit: Optional[_AuditBuffer],
+    ) -> str:
+        """Find matches of every PII type in one scan, transform them, and log compact audit info."""
+        if self._hs_db is not None:
+            return self._hs_rewrite(text, method_override, column, hinted_type, row, audit)
+
+        # Manual search + splice: unchanged segments and replacements go into
+        # one join instead of sub()'s piecewise string building. Crucially, a
+        # candidate that _decide rejects must not consume its span — the
+        # baseline's independent per-type passes each saw the full text, so a
+        # digit run that fails the card checks could still yield SSN/phone
+        # matches inside it.
+        parts: List[str] = []
+        last = 0  # end of the last replaced span
+        pos = 0  # next search offset
+        search = self._combined.search
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            ptype = m.lastgroup
+            raw = m.group(0)
+            end = m.end()
+            repl, act = self._decide(ptype, raw, method_override, column, hinted_type)
+            if act is None:
+                # The leading alternative can shadow other types at the same
+                # offset (e.g. an 18-digit run matches credit_card but holds
+                # two valid SSNs): try the remaining types here before moving
+                # the search along by one character.
+                for other in self._type_order[self._type_order.index(ptype) + 1:]:
+                    pm = self.PATTERNS[other].match(text, start)
+                    if pm is None:
+                        continue
+                    repl, act = self._decide(other, pm.group(0), method_override, column, hinted_type)
+                    if act is not None:
+                        ptype, raw, end = other, pm.group(0), pm.end()
+                        break
+            if act is None:
+                pos = start + 1  # rejected: leave the text, keep scanning
+                continue
+            if ptype == "address" and act == "mask":
+                # The mask re-emits the trail after the street suffix
+                # verbatim, so only the rewritten head is consumed and the
+                # trail stays in the scan stream (an SSN or phone there must
+                # still be caught, and a second pass must find nothing new)
+                repl, consumed = _trim_masked_address(raw, repl)
+                end = start + consumed
+            if audit is not None:
+                audit.append(row, column, ptype, raw, act, repl)
+            parts.append(text[last:start])
+            parts.append(repl)
+            last = end
+            pos = end
+        if not parts:
+            return text  # no matches: hand back the original, no allocation
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def _rewrite_one(
+        self,
+        text: str,
+        ptype: str,
+        method_override: Optional[str],
+        column: str,
+        row: int,
+        audit: Optional[_AuditBuffer],
+    ) -> str:
+        """Scan with a single type's pattern (strict hinted-column fast path)."""
+        parts: List[str] = []
+        last = 0
+        for m in self.PATTERNS[ptype].finditer(text):
+            parts.append(text[last:m.start()])
+            parts.append(
+                self._transform_match(ptype, m.group(0), method_override, column, ptype, row, audit)
             )
-            return repl
-
-        new_text = pattern.sub(_replacement, text)
-        return new_text, audit_spans
+            last = m.end()
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def _rewrite_hinted(
+        self,
+        text: str,
+        ptype: str,
+        method_override: Optional[str],
+        column: str,
+        row: int,
+        audit: Optional[_AuditBuffer],
+        memo: Dict[str, Tuple[str, Optional[str]]],
+    ) -> str:
+        """Column-level fast path for strict hinted columns.
+
+        A cell that is exactly one value of the hinted type is transformed
+        whole, and the decision is memoized per column so repeated values
+        (every action is deterministic) skip validate/tokenize entirely.
+        Mixed cells fall back to the single-pattern scan.
+        """
+        hit = memo.get(text)
+        if hit is None:
+            if self.PATTERNS[ptype].fullmatch(text):
+                hit = self._decide(ptype, text, method_override, column, ptype)
+                memo[text] = hit
+            else:
+                return self._rewrite_one(text, ptype, method_override, column, row, audit)
+        repl, act = hit
+        if act is not None and audit is not None:
+            audit.append(row, column, ptype, text, act, repl)
+        return repl
+
+    def _transform_match(
+        self,
+        ptype: str,
+        raw: str,
+        method_override: Optional[str],
+        column: str,
+        hinted_type: Optional[str],
+        row: int,
+        audit: Optional[_AuditBuffer],
+    ) -> str:
+        """Decide action for a match, validate it, replace it, and record an audit event."""
+        repl, act = self._decide(ptype, raw, method_override, column, hinted_type)
+
+        # Save a short audit preview (no raw PII); skipped entirely when the
+        # caller did not ask for an audit or the value was left alone
+        if act is not None and audit is not None:
+            audit.append(row, column, ptype, raw, act, repl)
+        return repl
+
+    def _decide(
+        self, ptype: str, raw: str, method_override: Optional[str], column: str, hinted_type: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """Validate a match and compute its replacement.
+
+        Returns (replacement, action); action is None when the value is left
+        unchanged (gated name, already sanitized, allowlisted, or invalid).
+        """
+        # Names are only rewritten for name-hinted columns (or when free-text
+        # detection is explicitly enabled)
+        if ptype == "name" and not (hinted_type == "name" or self.detect_names_in_free_text):
+            return raw, None
+
+        # Skip if already sanitized or explicitly allowlisted
+        if self._looks_sanitized(raw):
+            return raw, None
+        if raw in self.policy["allowlist"]:
+            return raw, None
+
+        # Decide action (denylist forces redact)
+        act = "redact" if raw in self.policy["denylist"] else self._action_for(ptype, method_override)
+
+        # Normalize + validate (e.g., Luhn for cards, 9 digits for SSN, etc.)
+        normalized, valid = self._normalize_and_validate(ptype, raw, column)
+        if not valid:
+            return raw, None  # treat as non-PII if validation fails
+
+        # Apply action
+        if act == "tokenize":
+            repl = self._tokenize(ptype, normalized)
+        elif act == "mask":
+            repl = self._mask(ptype, raw, normalized)
+        elif act == "scramble":
+            repl = self._scramble(raw)
+        elif act == "redact":
+            repl = "[REDACTED]"
+        else:
+            repl = raw
+
+        return repl, act
+
+    def _hs_rewrite(
+        self,
+        text: str,
+        method_override: Optional[str],
+        column: str,
+        hinted_type: Optional[str],
+        row: int,
+        audit: Optional[_AuditBuffer],
+    ) -> str:
+        """One Hyperscan pass over the cell, then splice replacements by span.
+
+        Hyperscan reports matches only, so spans are collected first and the
+        text is rebuilt segment by segment. Offsets are byte offsets into the
+        UTF-8 encoding of the cell.
+        """
+        data = text.encode("utf-8")
+        spans: List[Tuple[int, int, int]] = []  # (start, pattern id, end)
+
+        # *extra absorbs the differing tail arguments of the plain Hyperscan
+        # handler (context) and the Chimera handler (captured groups, context)
+        def _on_match(pid: int, start: int, end: int, flags: int, *extra):
+            spans.append((start, pid, end))
+
+        try:
+            self._hs_db.scan(data, match_event_handler=_on_match)
+        except Exception:
+            # Bindings accepted the compile but not the scan (API/signature
+            # drift): disable the database and fall back to the re path for
+            # this and all future cells
+            self._hs_db = None
+            return self._rewrite_all(text, method_override, column, hinted_type, row, audit)
+        if not spans:
+            return text
+
+        spans.sort()
+        parts: List[str] = []
+        last = 0
+        i = 0
+        while i < len(spans):
+            start, pid, end = spans[i]
+            # Hyperscan reports every end offset; keep the longest match for
+            # this (start, pattern), mirroring the greedy re alternation
+            j = i + 1
+            while j < len(spans) and spans[j][0] == start and spans[j][1] == pid:
+                end = max(end, spans[j][2])
+                j += 1
+            i = j
+            if start < last:
+                continue  # overlaps a span already rewritten
+            raw = data[start:end].decode("utf-8")
+            ptype = self._type_order[pid]
+            repl, act = self._decide(ptype, raw, method_override, column, hinted_type)
+            if act is None:
+                # Rejected candidate: leave last where it is so matches of
+                # other types inside this span stay eligible
+                continue
+            if ptype == "address" and act == "mask":
+                # Same as _rewrite_all: the masked trail is preserved
+                # verbatim, so don't advance last over it — spans there are
+                # in the list and must stay eligible. consumed is in
+                # characters; last is a byte offset.
+                repl, consumed = _trim_masked_address(raw, repl)
+                end = start + len(raw[:consumed].encode("utf-8"))
+            if audit is not None:
+                audit.append(row, column, ptype, raw, act, repl)
+            parts.append(data[last:start].decode("utf-8"))
+            parts.append(repl)
+            last = end
+        parts.append(data[last:].decode("utf-8"))
+        return "".join(parts)
+
+    def _build_hs_db(self):
+        """Compile the PII patterns into a Hyperscan database, or None to use re.
+
+        Tries Chimera first (supports the lookaround our patterns use), then
+        plain Hyperscan; any rejection falls back to the combined re scan.
+        """
+        if _hs is None:
+            return None
+        expressions = [p.pattern.encode("utf-8") for p in self.PATTERNS.values()]
+        ids = list(range(len(expressions)))
+        for kwargs in ({"chimera": True}, {}):
+            try:
+                db = _hs.Database(**kwargs)
+                db.compile(
+                    expressions=expressions,
+                    ids=ids,
+                    flags=[_hs.HS_FLAG_SOM_LEFTMOST] * len(expressions),
+                )
+                return db
+            except Exception:
+                continue
+        return None
 
     def _action_for(self, ptype: str, method_override: Optional[str]) -> str:
-        """Choose action: method override > per-type policy > default policy."""
-        if method_override:
-            return method_override
-        return self.policy["per_type"].get(ptype, {}).get("action") or self.policy["defaults"]["action"]
+        """Choose action: method override > per-type policy > default policy (precomputed)."""
+        return method_override or self._action_by_type[ptype]
 
     # ---------------- Validators & normalization ----------------
 
@@ -237,13 +703,12 @@ class SanitizeBot:
         Returns (normalized_value, is_valid).
         """
         if ptype == "credit_card":
-            digits = re.sub(r"\D", "", raw)
-            return digits, (13 <= len(digits) <= 19 and luhn_valid(digits))
+            return _card_normalize_valid(raw)
         if ptype == "ssn":
-            digits = re.sub(r"\D", "", raw)
+            digits = raw.translate(_KEEP_DIGITS)
             return digits, (len(digits) == 9)
         if ptype == "phone":
-            digits = re.sub(r"\D", "", raw)
+            digits = raw.translate(_KEEP_DIGITS)
             # Reject obvious card-like groupings (prevents masking invalid cards as phones)
             if re.search(r"(?:\d{4}[-\s]?){3,}\d{0,4}", raw):
                 return digits, False
@@ -261,14 +726,30 @@ class SanitizeBot:
 
     # ---------------- Actions ----------------
 
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[str]:
+        """LRU lookup in the token cache (refreshes recency on hit)."""
+        value = self._token_cache.get(key)
+        if value is not None:
+            self._token_cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: Tuple[str, str], value: str) -> None:
+        """LRU insert into the token cache, evicting the least recently used entry if full."""
+        self._token_cache[key] = value
+        if len(self._token_cache) > self._token_cache_max:
+            self._token_cache.popitem(last=False)
+
     def _tokenize(self, ptype: str, normalized: str) -> str:
         """Create a deterministic token (prefix + short HMAC-SHA256 base32), with simple caching."""
-        cache_key = f"{ptype}|{normalized}"
-        if cache_key in self._token_cache:
-            return self._token_cache[cache_key]
-        digest = hmac.new(self._hmac_key, msg=normalized.encode("utf-8"), digestmod=hashlib.sha256).digest()
+        cache_key = (ptype, normalized)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        h = self._hmac_proto.copy()
+        h.update(normalized.encode("utf-8"))
+        digest = h.digest()
         token = f"{self.TOKEN_PREFIXES.get(ptype, 'TOKEN_')}{_b32_short(digest)}"
-        self._token_cache[cache_key] = token
+        self._cache_put(cache_key, token)
         return token
 
     def _mask(self, ptype: str, raw: str, normalized: str) -> str:
@@ -281,7 +762,7 @@ class SanitizeBot:
             return "[MASKED]"
         if ptype == "phone":
             last4 = normalized[-4:] if len(normalized) >= 4 else normalized
-            cc_match = re.match(r"^\+?\d{1,3}", raw.replace(" ", ""))
+            cc_match = _PHONE_CC_RE.match(raw.replace(" ", ""))
             cc = cc_match.group(0) if cc_match else ""
             return f"{cc}***-***-{last4}"
         if ptype == "credit_card":
@@ -294,10 +775,7 @@ class SanitizeBot:
             masked_parts = [(p[0] + "***") if len(p) > 0 else "***" for p in parts]
             return " ".join(masked_parts)
         if ptype == "address":
-            m = re.match(
-                rf"^(?P<num>{ADDRESS_HOUSENUM})\s+(?P<street>{ADDRESS_STREET})\s(?P<suf>{ADDRESS_SUFFIX})\b(?P<trail>.*)$",
-                raw,
-            )
+            m = _ADDRESS_MASK_RE.match(raw)
             if m:
                 suf = m.group("suf")
                 trail = m.group("trail")
@@ -306,19 +784,26 @@ class SanitizeBot:
         return "[MASKED]"
 
     def _scramble(self, value: str) -> str:
-        """Return the same characters shuffled randomly (demo-only)."""
+        """Return the same characters shuffled deterministically (demo-only).
+
+        The private PRNG is reseeded from the HMAC of the value, so the same
+        input (under the same secret) always scrambles the same way — keeping
+        the action idempotent-friendly and cacheable — without touching the
+        global random state.
+        """
+        cache_key = ("scramble", value)  # "scramble" is not a ptype, so no collisions
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        h = self._hmac_proto.copy()
+        h.update(value.encode("utf-8"))
+        self._rng.seed(int.from_bytes(h.digest()[:8], "big"))
         chars = list(value)
-        random.shuffle(chars)
-        return "".join(chars)
+        self._rng.shuffle(chars)
+        out = "".join(chars)
+        self._cache_put(cache_key, out)
+        return out
 
-    def _looks_sanitized(self, text: str, ptype: str) -> bool:
+    def _looks_sanitized(self, text: str) -> bool:
         """Heuristic check to skip values that already look masked/tokenized/redacted."""
-        if text.startswith(self.TOKEN_PREFIXES.get(ptype, "TOKEN_")):
-            return True
-        if text.startswith(tuple(self.TOKEN_PREFIXES.values())):
-            return True
-        if text in {"[MASKED]", "[REDACTED]"}:
-            return True
-        if "***" in text or "****" in text:
-            return True
-        return False
+        return bool(self._sanitized_re.search(text))